@@ -1,4 +1,6 @@
+import functools
 import re
+import types
 
 from tclint.commands import get_commands
 from tclint.violations import Rule, Violation
@@ -12,61 +14,62 @@ from tclint.syntax_tree import (
     CommandSub,
 )
 
+# ref: https://github.com/eslint/eslint/blob/b29a16b22f234f6134475efb6c7be5ac946556ee/lib/rules/max-len.js#L101 # noqa: E501
+# ^ ironic lint waiver...
+_URL_RE = re.compile(r"[^:/?#]:\/\/[^?#]")
 
-class LineLengthChecker:
-    """Ensures lines aren't too long.
+_WHITESPACE = (" ", "\t")
+
+_TRAILING_WHITESPACE_MSG = "line has trailing whitespace"
 
-    Reports 'line-length' violations.
-    """
 
-    # ref: https://github.com/eslint/eslint/blob/b29a16b22f234f6134475efb6c7be5ac946556ee/lib/rules/max-len.js#L101 # noqa: E501
-    # ^ ironic lint waiver...
-    URL_RE = re.compile(r"[^:/?#]:\/\/[^?#]")
+class LineChecker:
+    """Runs the checks that operate on individual lines of the source, sharing a single
+    pass over the input.
+
+    Reports 'line-length' and 'trailing-whitespace' violations.
+    """
 
     def check(self, input, _, config):
         violations = []
+        append = violations.append
+        url_search = _URL_RE.search
+        max_length = config.style_line_length
+        max_length_msg = f"maximum allowed is {max_length}"
+        # looking up enum members goes through EnumMeta, so only do it once
+        line_length_rule = Rule.LINE_LENGTH
+        trailing_whitespace_rule = Rule.TRAILING_WHITESPACE
+        whitespace = _WHITESPACE
+        whitespace_chars = "".join(whitespace)
         for i, line in enumerate(input.split("\n")):
-            if self.URL_RE.search(line) is not None:
-                # ignore URLs
+            if not line:
+                # blank lines are common and can't violate either check
                 continue
 
             lineno = i + 1
-            if len(line) > config.style_line_length:
+
+            # URLs are exempt from the line length limit. Most lines are within the
+            # limit, so check the length first to avoid running the regex on them.
+            if len(line) > max_length and url_search(line) is None:
                 start = (lineno, 1)
                 end = (lineno, len(line) + 1)
-                violations.append(
+                append(
                     Violation(
-                        Rule.LINE_LENGTH,
-                        f"line length is {len(line)}, maximum allowed is"
-                        f" {config.style_line_length}",
+                        line_length_rule,
+                        f"line length is {len(line)}, {max_length_msg}",
                         start,
                         end,
                     )
                 )
 
-        return violations
-
-
-class TrailingWhitespaceChecker:
-    """Ensures lines don't include trailing whitespace.
-
-    Reports 'trailing-whitespace' violations.
-    """
-
-    def check(self, input, _, config):
-        violations = []
-        for i, line in enumerate(input.split("\n")):
-            lineno = i + 1
-
-            WHITESPACE = (" ", "\t")
-            if line.endswith(WHITESPACE):
-                start_col = len(line.rstrip("".join(WHITESPACE)))
+            if line.endswith(whitespace):
+                start_col = len(line.rstrip(whitespace_chars))
                 start = (lineno, start_col + 1)
                 end = (lineno, len(line) + 1)
-                violations.append(
+                append(
                     Violation(
-                        Rule.TRAILING_WHITESPACE,
-                        "line has trailing whitespace",
+                        trailing_whitespace_rule,
+                        _TRAILING_WHITESPACE_MSG,
                         start,
                         end,
                     )
@@ -75,22 +78,81 @@ class TrailingWhitespaceChecker:
         return violations
 
 
-class RedefinedBuiltinChecker(Visitor):
-    """Ensures names of built-in commands aren't reused by proc definitions.
+@functools.lru_cache(maxsize=8)
+def _builtin_command_names(commands):
+    """Returns the set of command names known for a given `commands` config value.
 
-    Reports 'redefined-builtin' violations.
+    Cached since the config value is usually shared by every file in a run.
     """
+    plugins = [commands] if commands is not None else []
+    return frozenset(get_commands(plugins).keys())
 
-    def check(self, _, tree, config):
+
+class TreeChecker(Visitor):
+    """Base class for checkers that find violations by visiting the syntax tree.
+
+    Subclasses reset any per-tree state in `start()` and append to `self._violations`
+    from their visit methods. A TreeChecker can be run on its own with `check()`, or
+    share a single traversal with other TreeCheckers through `CompoundChecker`.
+    """
+
+    def start(self, config):
         self._violations = []
 
-        plugins = [config.commands] if config.commands is not None else []
-        builtin_commands = get_commands(plugins)
-        self._commands = builtin_commands.keys()
+    def finish(self):
+        return self._violations
 
+    def check(self, _, tree, config):
+        self.start(config)
         tree.accept(self, recurse=True)
+        return self.finish()
 
-        return self._violations
+
+class CompoundChecker:
+    """Runs several TreeCheckers in one traversal of the syntax tree, rather than
+    walking the tree once per checker."""
+
+    def __init__(self, *checkers):
+        self._checkers = checkers
+
+        # Node subclass -> visit methods of each checker that handles it
+        self._dispatch = {}
+        for checker in checkers:
+            for node_cls, visit in checker._dispatch_table().items():
+                self._dispatch.setdefault(node_cls, []).append(
+                    types.MethodType(visit, checker)
+                )
+
+    def check(self, _, tree, config):
+        for checker in self._checkers:
+            checker.start(config)
+
+        nodes = tree.walk()
+        nodes.append(tree)
+
+        get_visits = self._dispatch.get
+        for node in nodes:
+            visits = get_visits(node.__class__)
+            if visits is not None:
+                for visit in visits:
+                    visit(node)
+
+        violations = []
+        for checker in self._checkers:
+            violations += checker.finish()
+
+        return violations
+
+
+class RedefinedBuiltinChecker(TreeChecker):
+    """Ensures names of built-in commands aren't reused by proc definitions.
+
+    Reports 'redefined-builtin' violations.
+    """
+
+    def start(self, config):
+        super().start(config)
+        self._commands = _builtin_command_names(config.commands)
 
     def visit_command(self, command):
         if command.routine != "proc":
@@ -114,12 +176,7 @@ class RedefinedBuiltinChecker(Visitor):
             )
 
 
-class UnbracedExprChecker(Visitor):
-    def check(self, _, tree, __):
-        self._violations = []
-        tree.accept(self, recurse=True)
-        return self._violations
-
+class UnbracedExprChecker(TreeChecker):
     def visit_command(self, command):
         if command.routine != "expr":
             return
@@ -169,14 +226,11 @@ class UnbracedExprChecker(Visitor):
         )
 
 
-class RedundantExprChecker(Visitor):
-    def check(self, _, tree, __):
-        self._violations = []
-        tree.accept(self, recurse=True)
-        return self._violations
-
+class RedundantExprChecker(TreeChecker):
     def _check_operand(self, operand):
-        if not isinstance(operand, CommandSub) or len(operand.children) != 1:
+        # Most operands aren't command substitutions, so do the cheap exact type check
+        # first. Nothing subclasses CommandSub, so this is equivalent to isinstance().
+        if operand.__class__ is not CommandSub or len(operand.children) != 1:
             return
 
         command = operand.children[0]
@@ -217,11 +271,12 @@ class RedundantExprChecker(Visitor):
 
 def get_checkers():
     checkers = (
-        RedefinedBuiltinChecker(),
-        UnbracedExprChecker(),
-        RedundantExprChecker(),
-        LineLengthChecker(),
-        TrailingWhitespaceChecker(),
+        CompoundChecker(
+            RedefinedBuiltinChecker(),
+            UnbracedExprChecker(),
+            RedundantExprChecker(),
+        ),
+        LineChecker(),
     )
 
     return checkers
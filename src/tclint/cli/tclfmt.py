@@ -3,8 +3,15 @@
 import argparse
 import pathlib
 import sys
-
-from tclint.cli.utils import resolve_sources, register_codec_warning
+from typing import Optional, Tuple
+
+from tclint.cli.utils import (
+    add_jobs_arg,
+    load_command_plugins,
+    map_sources,
+    resolve_sources,
+    register_codec_warning,
+)
 from tclint.config import (
     get_config,
     setup_tclfmt_config_cli_args,
@@ -14,6 +21,7 @@ from tclint.config import (
 )
 from tclint.parser import Parser, TclSyntaxError
 from tclint.format import Formatter, FormatterOpts
+from tclint.syntax_tree import Script
 
 try:
     from tclint._version import __version__  # type: ignore
@@ -27,7 +35,12 @@ EXIT_SYNTAX_ERROR = 2
 EXIT_INPUT_ERROR = 4
 
 
-def format(script: str, config: Config, debug=False) -> str:
+def format(script: str, config: Config, debug=False) -> Tuple[Script, str]:
+    """Formats `script` according to `config`.
+
+    Returns the syntax tree parsed from `script` along with the formatted result, so
+    that callers who need the tree don't have to parse the script again.
+    """
     plugins = [config.commands] if config.commands is not None else []
     parser = Parser(debug=debug, command_plugins=plugins)
 
@@ -39,18 +52,70 @@ def format(script: str, config: Config, debug=False) -> str:
             indent_namespace_eval=config.style_indent_namespace_eval,
         )
     )
-    return formatter.format_top(script, parser)
+    tree = parser.parse(script)
+    return tree, formatter.format_tree(script, tree)
+
+
+def check(
+    path: Optional[pathlib.Path],
+    script: str,
+    original_tree: Script,
+    formatted: str,
+    config: Config,
+):
+    if formatted == script:
+        # parsing is deterministic, so the trees must match
+        return
 
+    plugins = [config.commands] if config.commands is not None else []
+    parser = Parser(command_plugins=plugins)
+    try:
+        formatted_tree = parser.parse(formatted)
+    except TclSyntaxError as e:
+        line, col = e.start
+        print(
+            f"Warning: {path} formatted output has a syntax error at {line}:{col}: {e}",
+            file=sys.stderr,
+        )
+        return
 
-def check(path: pathlib.Path, script: str, formatted: str):
-    parser = Parser()
-    original_tree = parser.parse(script)
-    formatted_tree = parser.parse(formatted)
     if original_tree != formatted_tree:
         print(f"Warning: {path} syntax trees don't match", file=sys.stderr)
         print("\n".join(original_tree.diff(formatted_tree)), file=sys.stderr)
 
 
+def _format_source(
+    path: Optional[pathlib.Path],
+    script: Optional[str],
+    config: Config,
+    debug: int,
+    return_formatted: bool,
+):
+    """Formats a single source, reading it from `path` if `script` isn't provided.
+
+    Returns a tuple of whether formatting changed the script, the formatted script
+    (or None if there was a syntax error or `return_formatted` is False), and the
+    syntax error's message and position (or None if there wasn't one). Errors are
+    returned rather than raised so the result can be passed back from a worker
+    process, and the formatted script is only returned when it's needed to avoid
+    copying it back for nothing.
+    """
+    if script is None:
+        assert path is not None, "either a path or a script must be provided"
+        with open(path, "r", errors="replace_with_warning") as f:
+            script = f.read()
+
+    try:
+        tree, formatted = format(script, config, debug=(debug > 1))
+    except TclSyntaxError as e:
+        return False, None, (str(e), e.start)
+
+    if debug > 0:
+        check(path, script, tree, formatted, config)
+
+    return formatted != script, formatted if return_formatted else None, None
+
+
 def main():
     parser = argparse.ArgumentParser("tclfmt")
     parser.add_argument(
@@ -94,6 +159,7 @@ def main():
         default=None,
         metavar="<path>",
     )
+    add_jobs_arg(parser)
     setup_tclfmt_config_cli_args(parser)
     args = parser.parse_args()
 
@@ -127,41 +193,41 @@ def main():
 
     register_codec_warning("replace_with_warning")
 
-    reformat_count = 0
+    items = []
     for path in sources:
-        if path is None:
-            script = sys.stdin.read()
-            out_prefix = "(stdin)"
-        else:
-            with open(path, "r", errors="replace_with_warning") as f:
-                script = f.read()
-            out_prefix = str(path)
+        # stdin can only be read from this process
+        script = sys.stdin.read() if path is None else None
+        items.append(
+            (path, script, config.get_for_path(path), args.debug, not args.check)
+        )
 
-        try:
-            formatted = format(
-                script, config.get_for_path(path), debug=(args.debug > 1)
+    reformat_count = 0
+    load_command_plugins(item[2] for item in items)
+    results = map_sources(_format_source, items, args.jobs)
+    for path, (changed, formatted, error) in zip(sources, results):
+        out_prefix = str(path) if path is not None else "(stdin)"
+
+        if error is not None:
+            message, (line, col) = error
+            print(
+                f"{out_prefix}:{line}:{col}: syntax error: {message}", file=sys.stderr
             )
-            if args.in_place and path:
-                with open(path, "w") as f:
-                    f.write(formatted)
-            elif args.check:
-                if script != formatted:
-                    print(f"{out_prefix}: needs reformatting")
-                    retcode |= EXIT_FORMAT_VIOLATIONS
-                    reformat_count += 1
-            else:
-                if args.in_place:
-                    print("Warning: --in-place option ignored when reading from stdin")
-                print(formatted, end="")
-
-            if args.debug > 0:
-                check(path, script, formatted)
-        except TclSyntaxError as e:
-            line, col = e.pos
-            print(f"{out_prefix}:{line}:{col}: syntax error: {e}", file=sys.stderr)
             retcode |= EXIT_SYNTAX_ERROR
             continue
 
+        if args.in_place and path:
+            with open(path, "w") as f:
+                f.write(formatted)
+        elif args.check:
+            if changed:
+                print(f"{out_prefix}: needs reformatting")
+                retcode |= EXIT_FORMAT_VIOLATIONS
+                reformat_count += 1
+        else:
+            if args.in_place:
+                print("Warning: --in-place option ignored when reading from stdin")
+            print(formatted, end="")
+
     if args.check:
         messages = []
         if reformat_count == 0:
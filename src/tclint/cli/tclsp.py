@@ -1,7 +1,8 @@
 import argparse
 import logging
 from pathlib import Path
-from typing import List
+import threading
+from typing import List, Tuple
 import uuid
 
 from lsprotocol import types as lsp
@@ -74,7 +75,24 @@ class TclspServer(LanguageServer):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # Guards `diagnostics`, `lint_inputs`, `outdated`, `snapshots` and `configs`,
+        # which are shared between handlers on the event loop and handlers running on
+        # worker threads.
+        self.lock = threading.Lock()
         self.diagnostics = {}
+        # maps URI -> (source, version) of each open document, recorded on the event
+        # loop once pygls has applied every change. Worker threads lint these rather
+        # than the live documents, which pygls may be editing at the same time.
+        self.snapshots = {}
+        # maps URI -> (source, config) that were last linted, so that unchanged
+        # documents don't get linted again
+        self.lint_inputs = {}
+        # URIs that have changed since they were last linted. These get linted again
+        # when the client next pulls diagnostics, rather than on every change.
+        self.outdated = set()
+        # maps URI -> lock that serializes diagnostics requests for that document, so
+        # a request never sees another one's lint half done.
+        self.document_locks = {}
         # maps root path -> RunConfig, since there may be more than one workspace.
         self.configs = {}
         self.client_supports_refresh = False
@@ -95,7 +113,9 @@ class TclspServer(LanguageServer):
         return roots
 
     def load_configs(self):
-        self.configs = {}
+        # Build the new mapping separately and swap it in at the end, so that worker
+        # threads never see a partially loaded one.
+        configs = {}
         for root in self.get_roots():
             config = None
             try:
@@ -104,35 +124,74 @@ class TclspServer(LanguageServer):
                 self.show_message(f"Error loading config file: {e}")
 
             if config is not None:
-                for other in self.configs.keys():
+                for other in configs.keys():
                     if root.is_relative_to(other) or other.is_relative_to(root):
                         self.show_message(
                             f"Warning: found configs in overlapping workspaces: {root},"
                             f" {other}. It's undefined which will apply."
                         )
 
-                self.configs[root] = config
+                configs[root] = config
+
+        with self.lock:
+            self.configs = configs
 
     def get_config(self, path: Path) -> Config:
+        with self.lock:
+            configs = self.configs
+
         matching_config = Config()
-        for root, config in self.configs.items():
+        for root, config in configs.items():
             if path.is_relative_to(root):
                 matching_config = config.get_for_path(path)
                 break
         return matching_config
 
-    def parse(self, document: TextDocument):
+    def document_lock(self, uri: str) -> threading.Lock:
+        with self.lock:
+            return self.document_locks.setdefault(uri, threading.Lock())
+
+    def parse(self, document: TextDocument) -> Tuple[int, List[lsp.Diagnostic]]:
+        """Lints `document` if needed, and returns its version and diagnostics. Open
+        documents are linted from the snapshot taken when they last changed.
+
+        Callers must hold the document's lock from `document_lock()`. Only the linting
+        itself happens outside of `self.lock`.
+        """
+        uri = document.uri
         path = Path(document.path)
+
+        with self.lock:
+            self.outdated.discard(uri)
+            snapshot = self.snapshots.get(uri)
+
+        if snapshot is None:
+            # Not open in the client, so pygls won't be editing it
+            snapshot = (document.source, document.version)
+        source, version = snapshot
+
         config = self.get_config(path)
+        inputs = (source, config)
 
-        # `None` sentinel ensures that `diagnostics` gets updated if the URI is not
-        # present.
-        _, previous = self.diagnostics.get(document.uri, (0, None))
-        diagnostics = lint(document.source, config, path)
+        with self.lock:
+            entry = self.diagnostics.get(uri)
+            if entry is not None and self.lint_inputs.get(uri) == inputs:
+                # Linting is deterministic, so the diagnostics can't have changed
+                return entry
 
-        # Only update if the list has changed
-        if previous != diagnostics:
-            self.diagnostics[document.uri] = (document.version, diagnostics)
+        diagnostics = lint(source, config, path)
+
+        with self.lock:
+            entry = self.diagnostics.get(uri)
+            # Only update if the list has changed
+            if entry is None or entry[1] != diagnostics:
+                entry = (version, diagnostics)
+                self.diagnostics[uri] = entry
+            # Only record the inputs once their results are stored, so they're never
+            # matched against a lint that's still running.
+            self.lint_inputs[uri] = inputs
+
+            return entry
 
     def format(self, document: TextDocument, options: lsp.FormattingOptions):
         path = Path(document.path)
@@ -161,18 +220,41 @@ server = TclspServer("tclsp", __version__)
 
 @server.feature(lsp.TEXT_DOCUMENT_DID_OPEN)
 def did_open(ls: TclspServer, params: lsp.DidOpenTextDocumentParams):
-    """Parse each document when it is opened"""
-    logging.debug("Received %s: %s", lsp.TEXT_DOCUMENT_DID_OPEN, params)
-    doc = ls.workspace.get_text_document(params.text_document.uri)
-    ls.parse(doc)
+    """Mark each document to be parsed when it is opened"""
+    # params contain the full document text, so only log the URI
+    uri = params.text_document.uri
+    logging.debug("Received %s: %s", lsp.TEXT_DOCUMENT_DID_OPEN, uri)
+    doc = ls.workspace.get_text_document(uri)
+    with ls.lock:
+        ls.snapshots[uri] = (doc.source, doc.version)
+        ls.outdated.add(uri)
 
 
 @server.feature(lsp.TEXT_DOCUMENT_DID_CHANGE)
 def did_change(ls: TclspServer, params: lsp.DidOpenTextDocumentParams):
-    """Parse each document when it is changed"""
-    logging.debug("Received %s: %s", lsp.TEXT_DOCUMENT_DID_CHANGE, params)
-    doc = ls.workspace.get_text_document(params.text_document.uri)
-    ls.parse(doc)
+    """Mark each document to be parsed when it is changed. Parsing is deferred until
+    diagnostics are requested, so a burst of changes only gets linted once."""
+    # params contain the changed text, so only log the URI
+    uri = params.text_document.uri
+    logging.debug("Received %s: %s", lsp.TEXT_DOCUMENT_DID_CHANGE, uri)
+    doc = ls.workspace.get_text_document(uri)
+    with ls.lock:
+        ls.snapshots[uri] = (doc.source, doc.version)
+        ls.outdated.add(uri)
+
+
+@server.feature(lsp.TEXT_DOCUMENT_DID_CLOSE)
+def did_close(ls: TclspServer, params: lsp.DidCloseTextDocumentParams):
+    """Drop everything cached for a document when it is closed, so long sessions
+    don't accumulate state for documents that are no longer open."""
+    uri = params.text_document.uri
+    logging.debug("Received %s: %s", lsp.TEXT_DOCUMENT_DID_CLOSE, uri)
+    with ls.lock:
+        ls.diagnostics.pop(uri, None)
+        ls.lint_inputs.pop(uri, None)
+        ls.snapshots.pop(uri, None)
+        ls.document_locks.pop(uri, None)
+        ls.outdated.discard(uri)
 
 
 @server.feature(
@@ -187,17 +269,28 @@ def did_change(ls: TclspServer, params: lsp.DidOpenTextDocumentParams):
         workspace_diagnostics=False,
     ),
 )
+# Linting is CPU-bound, so run it on a worker thread to keep the server responsive to
+# other messages in the meantime.
+@server.thread()
 def document_diagnostic(ls: TclspServer, params: lsp.DocumentDiagnosticParams):
     """Return diagnostics for the requested document"""
     logging.debug("Received %s: %s", lsp.TEXT_DOCUMENT_DIAGNOSTIC, params)
 
-    was_cached = True
-    if (uri := params.text_document.uri) not in ls.diagnostics:
-        was_cached = False
-        doc = ls.workspace.get_text_document(uri)
-        ls.parse(doc)
-
-    version, diagnostics = ls.diagnostics[uri]
+    uri = params.text_document.uri
+    # Overlapping requests for the same document wait for each other. Otherwise, a
+    # request arriving while another is linting the latest version would see it as
+    # up to date, and return the previous version's diagnostics.
+    with ls.document_lock(uri):
+        with ls.lock:
+            entry = ls.diagnostics.get(uri)
+            outdated = uri in ls.outdated
+
+        was_cached = entry is not None
+        if entry is None or outdated:
+            doc = ls.workspace.get_text_document(uri)
+            entry = ls.parse(doc)
+
+    version, diagnostics = entry
     result_id = f"{uri}@{version}"
 
     if was_cached and result_id == params.previous_result_id:
@@ -210,15 +303,21 @@ def document_diagnostic(ls: TclspServer, params: lsp.DocumentDiagnosticParams):
 def change_watched_files(ls: TclspServer, params: lsp.DidChangeWatchedFilesParams):
     logging.debug("Received %s: %s", lsp.WORKSPACE_DID_CHANGE_WATCHED_FILES, params)
 
-    # Clear diagnostics cache so they get recalculated when requested
-    ls.diagnostics = {}
-
     ls.load_configs()
+
+    # Mark all diagnostics outdated so they get recalculated when requested. This is
+    # done after loading the new configs rather than by clearing the cache, so a lint
+    # that's still running on a worker thread with an old config can't leave its
+    # results looking current.
+    with ls.lock:
+        ls.outdated.update(ls.diagnostics.keys())
+        ls.lint_inputs = {}
     if ls.client_supports_refresh:
         ls.lsp.send_request(lsp.WORKSPACE_DIAGNOSTIC_REFRESH, None)
 
 
 @server.feature(lsp.TEXT_DOCUMENT_FORMATTING)
+@server.thread()
 def format_document(ls: TclspServer, params: lsp.DocumentFormattingParams):
     """Format the entire document"""
     doc = ls.workspace.get_text_document(params.text_document.uri)
@@ -227,7 +326,9 @@ def format_document(ls: TclspServer, params: lsp.DocumentFormattingParams):
         lsp.TextEdit(
             range=lsp.Range(
                 start=lsp.Position(line=0, character=0),
-                end=lsp.Position(line=len(formatted.split("\n")) + 1, character=0),
+                # Past the last line, so the edit replaces the whole document. Count
+                # newlines rather than splitting to avoid building a list of lines.
+                end=lsp.Position(line=formatted.count("\n") + 2, character=0),
             ),
             new_text=formatted,
         )
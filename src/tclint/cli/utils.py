@@ -1,11 +1,20 @@
 import codecs
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import io
+import itertools
+import multiprocessing
 import os
 import pathlib
 import re
-from typing import List, Optional
+import sys
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
 
 import pathspec
 
+from tclint.commands import get_commands
+from tclint.config import Config
+
 
 def register_codec_warning(name):
     def replace_with_warning_handler(e):
@@ -16,6 +25,86 @@ def register_codec_warning(name):
     codecs.register_error(name, replace_with_warning_handler)
 
 
+def add_jobs_arg(parser):
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="<jobs>",
+        help="number of files to process in parallel. Defaults to 1",
+    )
+
+
+def load_command_plugins(configs: Iterable[Config]):
+    """Loads the command plugins used by `configs`.
+
+    Plugins are otherwise loaded the first time a file that uses them is parsed. Doing
+    it before calling `map_sources()` means any warnings from loading them are only
+    printed once, and forked worker processes inherit the loaded plugins rather than
+    loading them again.
+    """
+    for commands in {config.commands for config in configs}:
+        if commands is not None:
+            get_commands([commands])
+
+
+def _run_captured(func, args):
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        result = func(*args)
+    return result, stdout.getvalue(), stderr.getvalue()
+
+
+def map_sources(
+    func: Callable[..., Any], items: Sequence[tuple], jobs: int
+) -> Iterator[Any]:
+    """Calls `func(*item)` for each of `items`, yielding the results in order.
+
+    If `jobs` is greater than 1 and there is more than one item, the calls are spread
+    across a pool of worker processes. Anything a call prints is captured in the
+    worker and replayed when its result is yielded, so output comes out in the same
+    order as it would when running serially. `func` must be a module-level function,
+    and its arguments and return value must be picklable.
+
+    Each worker has its own copy of any per-process state, so output from work that's
+    only done once per process (e.g. warnings from loading plugins) would be repeated
+    by every worker. Callers should do that work up front, before calling this.
+    """
+    if jobs <= 1 or len(items) <= 1:
+        for item in items:
+            yield func(*item)
+        return
+
+    workers = min(jobs, len(items))
+    # Hand out several items at a time to amortize the cost of sending work to the
+    # workers, while still leaving enough chunks to balance the load.
+    chunksize = max(1, len(items) // (4 * workers))
+
+    # Forked workers inherit the already-imported parser, checkers and loaded plugins
+    # instead of importing them again. Only use fork on Linux, since it isn't
+    # available on Windows and isn't safe on macOS. Newer Pythons no longer default to
+    # it on Linux either.
+    mp_context = None
+    if sys.platform == "linux":
+        mp_context = multiprocessing.get_context("fork")
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=register_codec_warning,
+        initargs=("replace_with_warning",),
+    ) as executor:
+        results = executor.map(
+            _run_captured, itertools.repeat(func), items, chunksize=chunksize
+        )
+        for result, stdout, stderr in results:
+            sys.stdout.write(stdout)
+            sys.stderr.write(stderr)
+            yield result
+
+
 def resolve_sources(
     paths: List[pathlib.Path],
     exclude_patterns: List[str],
@@ -32,15 +121,16 @@ def resolve_sources(
 
     Raises FileNotFoundError if a supplied path does not exist.
     """
-    extensions = [f".{ext}" if not ext.startswith(".") else ext for ext in extensions]
+    extension_set = {
+        f".{ext}" if not ext.startswith(".") else ext for ext in extensions
+    }
     exclude_root = exclude_root.resolve()
     exclude_patterns = [
         re.sub(r"^\s*#", r"\#", pattern) for pattern in exclude_patterns
     ]
     exclude_spec = pathspec.PathSpec.from_lines("gitwildmatch", exclude_patterns)
 
-    def is_excluded(path):
-        abspath = path.resolve()
+    def is_excluded(abspath):
         try:
             relpath = os.path.relpath(abspath, start=exclude_root)
         except ValueError:
@@ -64,19 +154,31 @@ def resolve_sources(
         if not path.exists():
             raise FileNotFoundError(f"path {path} does not exist")
 
-        if is_excluded(path):
+        abspath = str(path.resolve())
+        if is_excluded(abspath):
             continue
 
         if not path.is_dir():
             sources.append(path)
             continue
 
-        for dirpath, _, filenames in os.walk(path):
+        # Every directory yielded by os.walk() is prefixed by `top`, and os.walk()
+        # doesn't descend into symlinked directories, so a directory's resolved path
+        # can be built by swapping in the resolved prefix rather than calling
+        # resolve() (and hitting the filesystem) for each file. Symlinked files still
+        # need to be resolved, since exclude patterns are matched against their
+        # targets.
+        top = os.fspath(path)
+        for dirpath, _, filenames in os.walk(top):
+            abs_dirpath = abspath + dirpath[len(top) :]
             for name in filenames:
                 _, ext = os.path.splitext(name)
-                if ext.lower() in extensions:
-                    child = pathlib.Path(dirpath) / name
-                    if not is_excluded(child):
-                        sources.append(child)
+                if ext.lower() not in extension_set:
+                    continue
+                child_abspath = os.path.join(abs_dirpath, name)
+                if os.path.islink(child_abspath):
+                    child_abspath = str(pathlib.Path(child_abspath).resolve())
+                if not is_excluded(child_abspath):
+                    sources.append(pathlib.Path(dirpath) / name)
 
     return sources
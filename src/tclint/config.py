@@ -372,7 +372,8 @@ class RunConfig:
             raise ConfigError(f"pyproject.toml: {e}")
 
     def get_for_path(self, path) -> Config:
-        if path is None:
+        if path is None or not self._fileset_configs:
+            # skip resolving the path when there are no filesets to match against
             return self._global_config
 
         path = path.resolve()
@@ -113,6 +113,10 @@ class Formatter:
 
     def format_top(self, script: str, parser: Parser) -> str:
         tree = parser.parse(script)
+        return self.format_tree(script, tree)
+
+    def format_tree(self, script: str, tree: Script) -> str:
+        """Formats `tree`, which must have been parsed from `script`."""
         self.script = script.split("\n")
         return "\n".join(self.format_script_contents(tree)) + "\n"
 
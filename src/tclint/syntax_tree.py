@@ -1,9 +1,42 @@
 """Classes for representing and interacting with Tcl syntax trees. """
 
+from typing import Callable, Dict, Optional
+
 
 class Visitor:
     """Abstract base class for Visitors that operate on syntax tree."""
 
+    # Visitor subclass -> {Node subclass -> visit function}. Built lazily the first
+    # time a visitor class is used, so that per-node dispatch is a single dict lookup.
+    _dispatch_cache: Dict[type, Dict[type, Callable]] = {}
+
+    @classmethod
+    def _dispatch_table(cls) -> Dict[type, Callable]:
+        """Returns a mapping from Node subclass to the visit function that handles it
+        for this Visitor subclass.
+
+        Node types whose visit method isn't overridden are left out of the table, so
+        traversal can skip the call to the no-op default entirely.
+        """
+        try:
+            return Visitor._dispatch_cache[cls]
+        except KeyError:
+            pass
+
+        table: Dict[type, Callable] = {}
+        stack = list(Node.__subclasses__())
+        while stack:
+            node_cls = stack.pop()
+            stack.extend(node_cls.__subclasses__())
+            if node_cls._visit_name is None:
+                continue
+            visit = getattr(cls, node_cls._visit_name)
+            if visit is not getattr(Visitor, node_cls._visit_name):
+                table[node_cls] = visit
+
+        Visitor._dispatch_cache[cls] = table
+        return table
+
     def visit_script(self, script):
         pass
 
@@ -66,6 +99,9 @@ class Node:
     - self.children is a list of Node types
     """
 
+    # name of the Visitor method that handles this Node type
+    _visit_name: Optional[str] = None
+
     def __init__(self, *init, pos=None, end_pos=None):
         """pos: line, column of first character of parsed region (1-indexed)
         end_pos: line, column of first character after parsed region (1-indexed)
@@ -218,35 +254,59 @@ class Node:
 
         return (self.line, self.col)
 
-    def _recurse(self, visitor):
-        for child in self.children:
-            child.accept(visitor, recurse=True)
+    def accept(self, visitor, recurse=False):
+        dispatch = visitor._dispatch_table()
+        if recurse:
+            self._recurse(visitor, dispatch)
+        visit = dispatch.get(self.__class__)
+        if visit is not None:
+            visit(visitor, self)
+
+    def walk(self):
+        """Returns a flat list of all descendants of this node in post-order (children
+        before their parents, siblings in source order).
+
+        Built with an explicit stack rather than Python recursion, which is faster and
+        can't hit the recursion limit on deeply nested scripts.
+        """
+        # Pushing children in order and popping from the end gives a pre-order walk
+        # that visits siblings right-to-left, which is exactly post-order reversed.
+        nodes = []
+        stack = list(self.children)
+        pop = stack.pop
+        extend = stack.extend
+        append = nodes.append
+        while stack:
+            node = pop()
+            append(node)
+            extend(node.children)
+
+        nodes.reverse()
+        return nodes
+
+    def _recurse(self, visitor, dispatch):
+        get_visit = dispatch.get
+        for node in self.walk():
+            visit = get_visit(node.__class__)
+            if visit is not None:
+                visit(visitor, node)
 
 
 class Script(Node):
+    _visit_name = "visit_script"
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # hack for spaces-in-braces check
         self.braced = False
 
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_script(self)
-
 
 class Comment(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_comment(self)
+    _visit_name = "visit_comment"
 
 
 class Command(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_command(self)
+    _visit_name = "visit_command"
 
     @property
     def routine(self):
@@ -262,17 +322,11 @@ class Command(Node):
 
 
 class CommandSub(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_command_sub(self)
+    _visit_name = "visit_command_sub"
 
 
 class BareWord(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_bare_word(self)
+    _visit_name = "visit_bare_word"
 
     @property
     def contents(self):
@@ -284,10 +338,7 @@ class BareWord(Node):
 
 
 class BracedWord(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_braced_word(self)
+    _visit_name = "visit_braced_word"
 
     @property
     def contents(self):
@@ -299,10 +350,7 @@ class BracedWord(Node):
 
 
 class QuotedWord(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_quoted_word(self)
+    _visit_name = "visit_quoted_word"
 
     @property
     def contents(self):
@@ -326,28 +374,19 @@ class QuotedWord(Node):
 
 
 class CompoundBareWord(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_compound_bare_word(self)
+    _visit_name = "visit_compound_bare_word"
 
 
 class VarSub(Node):
+    _visit_name = "visit_var_sub"
+
     def __init__(self, *args, braced=False, **kwargs):
         self.braced = braced
         return super().__init__(*args, **kwargs)
 
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_var_sub(self)
-
 
 class ArgExpansion(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_arg_expansion(self)
+    _visit_name = "visit_arg_expansion"
 
 
 class List(Node):
@@ -355,56 +394,32 @@ class List(Node):
     command in a way that facilitates style checks. Might be nice to find
     another way to handle this that doesn't require a special Node."""
 
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_list(self)
+    _visit_name = "visit_list"
 
 
 class Expression(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_expression(self)
+    _visit_name = "visit_expression"
 
 
 class BracedExpression(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_braced_expression(self)
+    _visit_name = "visit_braced_expression"
 
 
 class ParenExpression(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_paren_expression(self)
+    _visit_name = "visit_paren_expression"
 
 
 class UnaryOp(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_unary_op(self)
+    _visit_name = "visit_unary_op"
 
 
 class BinaryOp(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_binary_op(self)
+    _visit_name = "visit_binary_op"
 
 
 class TernaryOp(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_ternary_op(self)
+    _visit_name = "visit_ternary_op"
 
 
 class Function(Node):
-    def accept(self, visitor, recurse=False):
-        if recurse:
-            self._recurse(visitor)
-        visitor.visit_function(self)
+    _visit_name = "visit_function"
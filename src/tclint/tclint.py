@@ -17,7 +17,13 @@ from tclint.parser import Parser, TclSyntaxError
 from tclint.checks import get_checkers
 from tclint.violations import Violation, Rule
 from tclint.comments import CommentVisitor
-from tclint.cli.utils import resolve_sources, register_codec_warning
+from tclint.cli.utils import (
+    add_jobs_arg,
+    load_command_plugins,
+    map_sources,
+    resolve_sources,
+    register_codec_warning,
+)
 
 try:
     from tclint._version import __version__  # type: ignore
@@ -34,16 +40,16 @@ EXIT_INPUT_ERROR = 4
 def filter_violations(
     violations, config_ignore, inline_ignore, path: Optional[pathlib.Path]
 ):
-    global_ignore = []
+    global_ignore = set()
     if path is not None:
         path = path.resolve()
     for entry in config_ignore:
         if isinstance(entry, Rule):
-            global_ignore.append(entry)
+            global_ignore.add(entry)
         elif path is not None:
             ignore_path = entry["path"].resolve()
             if path.is_relative_to(ignore_path):
-                global_ignore.extend(entry["rules"])
+                global_ignore.update(entry["rules"])
 
     filtered_violations = []
 
@@ -78,13 +84,41 @@ def lint(
     for checker in get_checkers():
         violations += checker.check(script, tree, config)
 
-    v = CommentVisitor()
-    ignore_lines = v.run(tree, path)
+    if "tclint-" in script:
+        v = CommentVisitor()
+        ignore_lines = v.run(tree, path)
+    else:
+        # Every waiver comment contains this prefix, so skip walking the tree when
+        # the script doesn't have any.
+        ignore_lines = {}
     violations = filter_violations(violations, config.ignore, ignore_lines, path)
 
     return violations
 
 
+def _lint_source(
+    path: Optional[pathlib.Path], script: Optional[str], config: Config, debug: int
+):
+    """Lints a single source, reading it from `path` if `script` isn't provided.
+
+    Returns a tuple of the sorted violations (or None if there was a syntax error) and
+    the syntax error's message and position (or None if there wasn't one). Errors are
+    returned rather than raised so the result can be passed back from a worker
+    process.
+    """
+    if script is None:
+        assert path is not None, "either a path or a script must be provided"
+        with open(path, "r", errors="replace_with_warning") as f:
+            script = f.read()
+
+    try:
+        violations = lint(script, config, path, debug=debug)
+    except TclSyntaxError as e:
+        return None, (str(e), e.start)
+
+    return sorted(violations), None
+
+
 def main():
     parser = argparse.ArgumentParser("tclint")
     parser.add_argument(
@@ -114,6 +148,7 @@ def main():
         default=None,
         metavar="<path>",
     )
+    add_jobs_arg(parser)
     setup_config_cli_args(parser)
     args = parser.parse_args()
 
@@ -147,32 +182,26 @@ def main():
 
     register_codec_warning("replace_with_warning")
 
+    items = []
     for path in sources:
-        if path is None:
-            script = sys.stdin.read()
-            out_prefix = "(stdin)"
-        else:
-            with open(path, "r", errors="replace_with_warning") as f:
-                script = f.read()
-            out_prefix = str(path)
-
-        try:
-            violations = lint(
-                script,
-                config.get_for_path(path),
-                path,
-                debug=args.debug,
-            )
-        except TclSyntaxError as e:
-            line, col = e.start
-            print(f"{out_prefix}:{line}:{col}: syntax error: {e}")
+        # stdin can only be read from this process
+        script = sys.stdin.read() if path is None else None
+        items.append((path, script, config.get_for_path(path), args.debug))
+
+    load_command_plugins(config for _, _, config, _ in items)
+    results = map_sources(_lint_source, items, args.jobs)
+    for path, (violations, error) in zip(sources, results):
+        out_prefix = str(path) if path is not None else "(stdin)"
+
+        if error is not None:
+            message, (line, col) = error
+            print(f"{out_prefix}:{line}:{col}: syntax error: {message}")
             retcode |= EXIT_SYNTAX_ERROR
             continue
 
-        for violation in sorted(violations):
-            print(f"{out_prefix}:{violation.str()}")
-
         if len(violations) > 0:
+            # write each file's violations in one go rather than a line at a time
+            print("\n".join(f"{out_prefix}:{v.str()}" for v in violations))
             retcode |= EXIT_LINT_VIOLATIONS
 
     return retcode
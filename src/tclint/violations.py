@@ -17,6 +17,11 @@ class Rule(Enum):
     UNBRACED_EXPR = "unbraced-expr"
     REDUNDANT_EXPR = "redundant-expr"
 
+    # Members are singletons compared by identity, so hash by identity too. Enum's
+    # default __hash__ hashes the member name in Python code, which is slow for the
+    # set lookups done when filtering violations.
+    __hash__ = object.__hash__
+
     def __str__(self):
         return self.value
 
@@ -25,6 +30,9 @@ ALL_RULES = [rule for rule in Rule]
 
 
 class Violation:
+    # A run can produce many violations, so skip the per-instance __dict__
+    __slots__ = ("id", "message", "start", "end")
+
     def __init__(
         self, id: Rule, message: str, start: Tuple[int, int], end: Tuple[int, int]
     ):
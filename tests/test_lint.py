@@ -1,6 +1,13 @@
 from pathlib import Path
 
 from tclint.tclint import lint
+from tclint.checks import (
+    CompoundChecker,
+    RedefinedBuiltinChecker,
+    RedundantExprChecker,
+    UnbracedExprChecker,
+)
+from tclint.parser import Parser
 from tclint.config import Config
 from tclint.violations import Rule
 
@@ -138,3 +145,41 @@ def test_proc_no_args():
     violations = lint(script, Config(), Path())
     assert len(violations) == 1
     assert violations[0].id == Rule("command-args")
+
+
+def test_trailing_whitespace():
+    script = "set a 1\t \n  \nset b 2"
+    violations = lint(script, Config(), Path())
+    assert len(violations) == 2
+    assert all(v.id == Rule.TRAILING_WHITESPACE for v in violations)
+
+    assert violations[0].start == (1, 8)
+    assert violations[0].end == (1, 10)
+    assert violations[1].start == (2, 1)
+    assert violations[1].end == (2, 3)
+
+
+def test_compound_checker():
+    """Running tree checkers together should match running them one at a time."""
+    script = r"""
+proc puts {} {
+    expr $foo
+    expr {[expr 1] + 2}
+}
+""".strip()
+    tree = Parser().parse(script)
+    checkers = [
+        RedefinedBuiltinChecker(),
+        UnbracedExprChecker(),
+        RedundantExprChecker(),
+    ]
+
+    expected = []
+    for checker in checkers:
+        expected += checker.check(script, tree, Config())
+
+    violations = CompoundChecker(*checkers).check(script, tree, Config())
+
+    assert [v.id for v in violations] == [v.id for v in expected]
+    assert [v.start for v in violations] == [v.start for v in expected]
+    assert len(violations) == 3
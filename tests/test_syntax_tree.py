@@ -0,0 +1,61 @@
+from tclint.syntax_tree import (
+    Visitor,
+    Script,
+    Command,
+    CommandSub,
+    BareWord,
+    QuotedWord,
+)
+
+
+class _RecordingVisitor(Visitor):
+    def __init__(self):
+        self.visited = []
+
+    def visit_script(self, script):
+        self.visited.append(script)
+
+    def visit_command(self, command):
+        self.visited.append(command)
+
+    def visit_bare_word(self, word):
+        self.visited.append(word)
+
+
+def test_visit_post_order():
+    puts = BareWord("puts")
+    hello = BareWord("hello")
+    quoted = QuotedWord(hello)
+    command = Command(puts, quoted)
+    tree = Script(command)
+
+    v = _RecordingVisitor()
+    tree.accept(v, recurse=True)
+
+    # QuotedWord isn't handled by the visitor, but its children still get visited
+    assert v.visited == [puts, hello, command, tree]
+
+
+def test_visit_deeply_nested():
+    depth = 10000
+    tree = BareWord("leaf")
+    for _ in range(depth):
+        tree = Script(Command(CommandSub(tree)))
+
+    v = _RecordingVisitor()
+    tree.accept(v, recurse=True)
+
+    assert len(v.visited) == 2 * depth + 1
+    assert v.visited[0].value == "leaf"
+    assert v.visited[-1] is tree
+
+
+def test_walk():
+    puts = BareWord("puts")
+    hello = BareWord("hello")
+    quoted = QuotedWord(hello)
+    command = Command(puts, quoted)
+    tree = Script(command)
+
+    assert tree.walk() == [puts, hello, quoted, command]
+    assert hello.walk() == []
@@ -4,6 +4,10 @@ import pathlib
 import shutil
 import subprocess
 
+from tclint.cli import tclfmt
+from tclint.config import Config
+from tclint.parser import Parser
+
 MY_DIR = pathlib.Path(__file__).parent.resolve()
 
 
@@ -41,3 +45,33 @@ def test_tclfmt_in_place(tmp_path):
 
     assert p.returncode == 0
     assert actual == expected
+
+
+def test_tclfmt_jobs(tmp_path):
+    """Output should be the same regardless of how many files are formatted in
+    parallel."""
+    test_data = MY_DIR / "data" / "dirty.tcl"
+    for i in range(4):
+        shutil.copyfile(test_data, tmp_path / f"dirty{i}.tcl")
+    with open(tmp_path / "bad.tcl", "w") as f:
+        f.write('puts "abc\n')
+
+    outputs = []
+    for jobs in ("1", "4"):
+        cmd = ["tclfmt", "--check", "--jobs", jobs, tmp_path]
+        p = subprocess.run(cmd, capture_output=True, cwd=MY_DIR)
+        assert p.returncode == 3
+        outputs.append((p.stdout, p.stderr))
+
+    assert outputs[0] == outputs[1]
+    assert b"bad.tcl:1:6: syntax error" in outputs[0][1]
+
+
+def test_check_unparseable_output(capsys):
+    """The debug check should warn, not crash, if the formatter's output doesn't
+    parse."""
+    script = "puts hello\n"
+    tree = Parser().parse(script)
+    tclfmt.check(None, script, tree, 'puts "hello\n', Config())
+
+    assert "formatted output has a syntax error" in capsys.readouterr().err
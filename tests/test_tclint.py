@@ -1,5 +1,6 @@
 import os
 import pathlib
+import shutil
 import subprocess
 
 import pytest
@@ -88,6 +89,50 @@ def test_read_stdin():
     assert stderr == b""
 
 
+def test_tclint_jobs(tmp_path):
+    """Output should be the same regardless of how many files are linted in
+    parallel."""
+    for i in range(4):
+        shutil.copyfile(test_case_dir / "dirty.tcl", tmp_path / f"dirty{i}.tcl")
+    with open(tmp_path / "bad.tcl", "w") as f:
+        f.write('puts "abc\n')
+
+    outputs = []
+    for jobs in ("1", "4"):
+        cmd = ["tclint", "--jobs", jobs, tmp_path]
+        p = subprocess.run(cmd, capture_output=True, cwd=MY_DIR)
+        assert p.returncode == 3
+        outputs.append(p.stdout)
+
+    assert outputs[0] == outputs[1]
+    assert b"bad.tcl:1:6: syntax error" in outputs[0]
+    assert outputs[0].count(b"[unbraced-expr]") == 4
+
+
+def test_tclint_jobs_plugin_warning(tmp_path):
+    """Warnings from loading plugins should only be printed once, even when linting
+    in parallel."""
+    for i in range(4):
+        shutil.copyfile(test_case_dir / "clean.tcl", tmp_path / f"clean{i}.tcl")
+
+    outputs = []
+    for jobs in ("1", "4"):
+        cmd = [
+            "tclint",
+            "--jobs",
+            jobs,
+            "--commands",
+            tmp_path / "nonexistent.json",
+            tmp_path,
+        ]
+        p = subprocess.run(cmd, capture_output=True, cwd=MY_DIR)
+        assert p.returncode == 0
+        outputs.append(p.stdout)
+
+    assert outputs[0] == outputs[1]
+    assert outputs[0].count(b"Warning: command spec") == 1
+
+
 def test_resolve_sources(tmp_path_factory):
     tmp_path = tmp_path_factory.mktemp("a")
     (tmp_path / "src").mkdir()
@@ -162,6 +207,25 @@ def test_resolve_sources(tmp_path_factory):
     os.chdir(cwd)
 
 
+def test_resolve_sources_symlink(tmp_path):
+    """Exclude patterns should be matched against the targets of symlinked files."""
+    src_dir = tmp_path / "src"
+    vendor_dir = tmp_path / "vendor"
+    src_dir.mkdir()
+    vendor_dir.mkdir()
+    (vendor_dir / "a.tcl").touch()
+    (src_dir / "b.tcl").touch()
+    (src_dir / "link.tcl").symlink_to(pathlib.Path("..") / "vendor" / "a.tcl")
+
+    sources = tclint.resolve_sources(
+        [src_dir],
+        exclude_patterns=["vendor/"],
+        exclude_root=tmp_path,
+        extensions=["tcl"],
+    )
+    assert sources == [src_dir / "b.tcl"]
+
+
 def test_resolve_sources_extensions(tmp_path):
     foo_file = tmp_path / "file.foo"
     foo_file.touch()
@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 import shutil
 import sys
@@ -69,6 +70,137 @@ async def test_diagnostics(client: pytest_lsp.LanguageClient):
     assert items[1].range.end.character == 22
 
 
+@pytest.mark.asyncio
+async def test_did_change(client: pytest_lsp.LanguageClient, tmp_path):
+    """Diagnostics should reflect edits made since the last request."""
+    params = lsp.InitializeParams(capabilities=get_capabilities("visual-studio-code"))
+    await client.initialize_session(params)
+
+    uri = (tmp_path / "source.tcl").as_uri()
+    client.text_document_did_open(
+        params=lsp.DidOpenTextDocumentParams(
+            text_document=lsp.TextDocumentItem(
+                uri=uri, language_id="tcl", version=1, text="expr $foo\n"
+            )
+        )
+    )
+
+    results = await client.text_document_diagnostic_async(
+        params=lsp.DocumentDiagnosticParams(
+            text_document=lsp.TextDocumentIdentifier(uri=uri)
+        )
+    )
+    assert len(results.items) == 1
+    assert results.items[0].code == "unbraced-expr"
+
+    for version, text in ((2, "expr {$"), (3, "expr {$foo}\n")):
+        client.text_document_did_change(
+            params=lsp.DidChangeTextDocumentParams(
+                text_document=lsp.VersionedTextDocumentIdentifier(
+                    uri=uri, version=version
+                ),
+                content_changes=[lsp.TextDocumentContentChangeEvent_Type2(text=text)],
+            )
+        )
+
+    results = await client.text_document_diagnostic_async(
+        params=lsp.DocumentDiagnosticParams(
+            text_document=lsp.TextDocumentIdentifier(uri=uri),
+            previous_result_id=results.result_id,
+        )
+    )
+    assert results.kind == "full"
+    assert results.items == []
+
+
+@pytest.mark.asyncio
+async def test_did_close(client: pytest_lsp.LanguageClient, tmp_path):
+    """Closing a document should drop its cached diagnostics."""
+    params = lsp.InitializeParams(capabilities=get_capabilities("visual-studio-code"))
+    await client.initialize_session(params)
+
+    uri = (tmp_path / "source.tcl").as_uri()
+    open_params = lsp.DidOpenTextDocumentParams(
+        text_document=lsp.TextDocumentItem(
+            uri=uri, language_id="tcl", version=1, text="expr $foo\n"
+        )
+    )
+    client.text_document_did_open(params=open_params)
+    results = await client.text_document_diagnostic_async(
+        params=lsp.DocumentDiagnosticParams(
+            text_document=lsp.TextDocumentIdentifier(uri=uri)
+        )
+    )
+    assert len(results.items) == 1
+
+    client.text_document_did_close(
+        params=lsp.DidCloseTextDocumentParams(
+            text_document=lsp.TextDocumentIdentifier(uri=uri)
+        )
+    )
+    client.text_document_did_open(params=open_params)
+
+    # Nothing is cached any more, so this gets a full report even though the result
+    # ID matches
+    results = await client.text_document_diagnostic_async(
+        params=lsp.DocumentDiagnosticParams(
+            text_document=lsp.TextDocumentIdentifier(uri=uri),
+            previous_result_id=results.result_id,
+        )
+    )
+    assert results.kind == "full"
+    assert len(results.items) == 1
+
+
+@pytest.mark.asyncio
+async def test_overlapping_pulls(client: pytest_lsp.LanguageClient, tmp_path):
+    """A pull that arrives while another is linting the same document should get the
+    new diagnostics, not the previous version's."""
+    params = lsp.InitializeParams(capabilities=get_capabilities("visual-studio-code"))
+    await client.initialize_session(params)
+
+    uri = (tmp_path / "source.tcl").as_uri()
+    client.text_document_did_open(
+        params=lsp.DidOpenTextDocumentParams(
+            text_document=lsp.TextDocumentItem(
+                uri=uri, language_id="tcl", version=1, text="puts hello\n"
+            )
+        )
+    )
+
+    results = await client.text_document_diagnostic_async(
+        params=lsp.DocumentDiagnosticParams(
+            text_document=lsp.TextDocumentIdentifier(uri=uri)
+        )
+    )
+    assert results.items == []
+    previous_result_id = results.result_id
+
+    # big enough that the first pull is still linting when the second arrives
+    text = "set a 1\n" * 5000 + "expr $foo\n"
+    client.text_document_did_change(
+        params=lsp.DidChangeTextDocumentParams(
+            text_document=lsp.VersionedTextDocumentIdentifier(uri=uri, version=2),
+            content_changes=[lsp.TextDocumentContentChangeEvent_Type2(text=text)],
+        )
+    )
+
+    pull = lsp.DocumentDiagnosticParams(
+        text_document=lsp.TextDocumentIdentifier(uri=uri),
+        previous_result_id=previous_result_id,
+    )
+    all_results = await asyncio.gather(
+        client.text_document_diagnostic_async(params=pull),
+        client.text_document_diagnostic_async(params=pull),
+    )
+
+    for results in all_results:
+        assert results.kind == "full"
+        assert results.result_id != previous_result_id
+        assert len(results.items) == 1
+        assert results.items[0].code == "unbraced-expr"
+
+
 @pytest.mark.asyncio
 async def test_format(client: pytest_lsp.LanguageClient, tmp_path):
     """Formatting test."""